@@ -4,9 +4,110 @@ Alternative Reddit scraper using different approaches
 """
 
 import requests
+import heapq
+from array import array
 import json
-from typing import List, Dict
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, Iterator, List, Dict, Optional, Sequence, Tuple
 import time
+from types import MappingProxyType
+
+from config import SCRAPER_CONFIG
+from http_utils import REQUEST_TIMEOUT, KeepAliveAdapter, build_retry
+from models import Post
+
+# orjson is optional; it decodes large listing payloads noticeably faster
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# ijson is optional; with it listings are parsed while the body is still arriving
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path(os.path.expanduser(SCRAPER_CONFIG['cache_dir']))
+# Bump when the shape of cached entries changes so old files are ignored
+CACHE_VERSION = b'posts-v3'
+
+def _cache_key(url: str, params: Dict) -> str:
+    """Build a stable cache key from a request URL and its query params"""
+    raw = CACHE_VERSION + url.encode() + json.dumps(params, sort_keys=True).encode()
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def _cache_get(key: str, ttl: int) -> Optional[List[Post]]:
+    """Return the cached posts for key, or None if missing or older than ttl"""
+    path = CACHE_DIR / f"{key}.json"
+    try:
+        entry = _loads(path.read_bytes())
+        if time.time() - entry['stored_at'] > ttl:
+            return None
+        # Bump mtime so eviction drops the least recently used entries first
+        os.utime(path)
+        return [Post(**fields) for fields in entry['data']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _cache_put(key: str, posts: List[Post]) -> None:
+    """Store posts on disk, evicting the least recently used entries"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'stored_at': time.time(), 'data': [asdict(post) for post in posts]}, f)
+        os.replace(tmp_path, CACHE_DIR / f"{key}.json")
+        
+        entries = sorted(CACHE_DIR.glob('*.json'), key=lambda p: p.stat().st_mtime)
+        for stale in entries[:-SCRAPER_CONFIG['cache_max_entries']]:
+            stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Could not write scraper cache: %s", e)
+
+def _iter_children(response) -> Iterable[Dict]:
+    """Yield the children of a streamed listing response"""
+    if ijson is not None:
+        # Parse children one at a time as bytes arrive instead of buffering the body
+        response.raw.decode_content = True
+        return ijson.items(response.raw, 'data.children.item', use_float=True)
+    
+    data = _loads(response.content)
+    # Error bodies and comment pages aren't listing objects; they hold no posts
+    if isinstance(data, dict) and isinstance(data.get('data'), dict):
+        return data['data'].get('children', [])
+    return []
+
+def top_indices(values: Sequence[float], limit: int) -> List[int]:
+    """Return the indices of the largest values in a column, best first"""
+    return heapq.nlargest(limit, range(len(values)), key=values.__getitem__)
+
+def _hot_score(score: int, num_comments: int, created_utc: float, now: float) -> float:
+    """Engagement per hour of age; comments count double"""
+    age_hours = max(0.0, now - created_utc) / 3600.0
+    return (score + 2.0 * num_comments) / (1.0 + age_hours)
+
+def rank_posts(columns: Dict[str, Sequence], limit: int, now: float = None) -> List[int]:
+    """
+    Return the row indices of the hottest posts in a columnar result, best first
+    """
+    if now is None:
+        now = time.time()
+    
+    hot = list(map(_hot_score, columns['score'], columns['num_comments'],
+                   columns['created_utc'], repeat(now)))
+    return top_indices(hot, limit)
 
 class RedditJSONScraper:
     """
@@ -18,86 +119,211 @@ class RedditJSONScraper:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        
+        # Reuse connections to reddit.com across calls and retry transient failures
+        retry = build_retry(SCRAPER_CONFIG['retry_attempts'], SCRAPER_CONFIG['retry_delay'])
+        adapter = KeepAliveAdapter(max_retries=retry, pool_connections=10, pool_maxsize=20)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.headers.update(self.headers)
+        
+        # Fixed parts of every search request, built once per scraper
+        self._search_global_url = f"{self.base_url}/search.json"
+        self._search_params = {'sort': 'relevance'}
     
-    def search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> List[Dict]:
+    def _fetch_posts(self, url: str, params: Dict, ttl: int) -> Iterator[Post]:
         """
-        Search posts using Reddit's JSON API
+        Yield a listing endpoint's posts as they are parsed, serving them
+        from the on-disk cache while fresh
+        """
+        key = _cache_key(url, params)
+        cached = _cache_get(key, ttl)
+        if cached is not None:
+            yield from cached
+            return
+        
+        posts = []
+        with self.session.get(url, params=params, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            for child in _iter_children(response):
+                post = self._build_post(child['data'])
+                posts.append(post)
+                yield post
+        _cache_put(key, posts)
+    
+    def _build_post(self, post_data: Dict) -> Post:
+        """
+        Convert a listing child's data into a Post
+        """
+        return Post.from_json(post_data, self.base_url)
+    
+    def _iter_search(self, url: str, query: str, limit: int) -> Iterator[Post]:
+        """
+        Yield the posts of one search endpoint
+        """
+        params = {**self._search_params, 'q': query, 'limit': limit}
+        return self._fetch_posts(url, params, SCRAPER_CONFIG['cache_ttl']['search'])
+    
+    def _search(self, url: str, query: str, limit: int) -> List[Post]:
+        """
+        Collect the posts of one search endpoint, returning [] on errors
         """
         posts = []
         
         try:
-            if subreddit:
-                # Search within specific subreddit
-                url = f"{self.base_url}/r/{subreddit}/search.json"
-                params = {'q': query, 'sort': 'relevance', 'limit': limit}
-            else:
-                # Search across all Reddit
-                url = f"{self.base_url}/search.json"
-                params = {'q': query, 'sort': 'relevance', 'limit': limit}
-            
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if 'data' in data and 'children' in data['data']:
-                for child in data['data']['children']:
-                    post_data = child['data']
-                    
-                    post = {
-                        'title': post_data.get('title', ''),
-                        'content': post_data.get('selftext', ''),
-                        'author': post_data.get('author', '[deleted]'),
-                        'score': post_data.get('score', 0),
-                        'num_comments': post_data.get('num_comments', 0),
-                        'url': post_data.get('url', ''),
-                        'subreddit': post_data.get('subreddit', 'unknown'),
-                        'created_utc': post_data.get('created_utc', 0),
-                        'permalink': f"{self.base_url}{post_data.get('permalink', '')}"
-                    }
-                    posts.append(post)
+            posts = list(self._iter_search(url, query, limit))
             
         except Exception as e:
-            print(f"Error with JSON API: {e}")
+            logger.warning("Error with JSON API: %s", e, exc_info=True)
         
         return posts
     
-    def get_hot_posts(self, subreddit: str, limit: int = 10) -> List[Dict]:
+    def iter_search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> Iterator[Post]:
+        """
+        Search posts using Reddit's JSON API, yielding each post as soon as it is parsed
+        
+        Unlike search_posts, request errors are raised to the caller.
+        """
+        if subreddit:
+            return self._iter_search(f"{self.base_url}/r/{subreddit}/search.json", query, limit)
+        return self._iter_search(self._search_global_url, query, limit)
+    
+    def search_subreddit(self, subreddit: str, query: str, limit: int = 10) -> List[Post]:
+        """
+        Search posts within a single subreddit
+        """
+        return self._search(f"{self.base_url}/r/{subreddit}/search.json", query, limit)
+    
+    def search_global(self, query: str, limit: int = 10) -> List[Post]:
+        """
+        Search posts across all of Reddit
+        """
+        return self._search(self._search_global_url, query, limit)
+    
+    def search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> List[Post]:
+        """
+        Search posts using Reddit's JSON API
+        """
+        if subreddit:
+            return self.search_subreddit(subreddit, query, limit)
+        return self.search_global(query, limit)
+    
+    def search_posts_columnar(self, query: str, subreddit: str = None, limit: int = 10) -> Dict[str, Sequence]:
+        """
+        Search posts and return them as columns instead of a list of dicts
+        
+        Text fields are lists; score, num_comments and created_utc are typed
+        arrays, so ranking (see top_indices) scans contiguous numbers only.
+        """
+        columns = {
+            'title': [],
+            'content': [],
+            'author': [],
+            'url': [],
+            'subreddit': [],
+            'permalink': [],
+            'score': array('q'),
+            'num_comments': array('q'),
+            'created_utc': array('d'),
+        }
+        
+        try:
+            # Fill the columns straight from the stream; no post list is kept
+            for post in self.iter_search_posts(query, subreddit, limit):
+                for field, column in columns.items():
+                    column.append(getattr(post, field))
+            
+        except Exception as e:
+            logger.warning("Error with JSON API: %s", e, exc_info=True)
+        
+        return columns
+    
+    def iter_hot_posts(self, subreddit: str, limit: int = 10) -> Iterator[Post]:
+        """
+        Get hot posts from a subreddit, yielding each post as soon as it is parsed
+        
+        Unlike get_hot_posts, request errors are raised to the caller.
+        """
+        url = f"{self.base_url}/r/{subreddit}/hot.json"
+        params = {'limit': limit}
+        
+        return self._fetch_posts(url, params, SCRAPER_CONFIG['cache_ttl']['hot'])
+    
+    def get_hot_posts(self, subreddit: str, limit: int = 10) -> List[Post]:
         """
         Get hot posts from a subreddit using JSON API
         """
         posts = []
         
         try:
-            url = f"{self.base_url}/r/{subreddit}/hot.json"
-            params = {'limit': limit}
-            
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if 'data' in data and 'children' in data['data']:
-                for child in data['data']['children']:
-                    post_data = child['data']
-                    
-                    post = {
-                        'title': post_data.get('title', ''),
-                        'content': post_data.get('selftext', ''),
-                        'author': post_data.get('author', '[deleted]'),
-                        'score': post_data.get('score', 0),
-                        'num_comments': post_data.get('num_comments', 0),
-                        'url': post_data.get('url', ''),
-                        'subreddit': post_data.get('subreddit', 'unknown'),
-                        'created_utc': post_data.get('created_utc', 0),
-                        'permalink': f"{self.base_url}{post_data.get('permalink', '')}"
-                    }
-                    posts.append(post)
+            posts = list(self.iter_hot_posts(subreddit, limit))
             
         except Exception as e:
-            print(f"Error getting hot posts: {e}")
+            logger.warning("Error getting hot posts: %s", e, exc_info=True)
         
         return posts
+    
+    def search_many(self, queries: List[Tuple[str, str]], limit: int = 10) -> List[List[Post]]:
+        """
+        Run several (query, subreddit) searches concurrently
+        
+        Results are returned in the same order as the queries.
+        """
+        if not queries:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as executor:
+            return list(executor.map(lambda q: self.search_posts(q[0], q[1], limit), queries))
+    
+    def get_hot_posts_many(self, subreddits: List[str], limit: int = 10) -> Dict[str, List[Post]]:
+        """
+        Get hot posts from several subreddits concurrently, keyed by subreddit
+        """
+        if not subreddits:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(subreddits))) as executor:
+            return dict(zip(subreddits, executor.map(lambda s: self.get_hot_posts(s, limit), subreddits)))
+
+# Shared, read-only sample data so every mock instance reuses the same objects
+_SAMPLE_POSTS = (
+    MappingProxyType({
+        'title': 'What are the best programming languages to learn in 2024?',
+        'content': 'I want to start learning programming and wondering what languages are most in demand.',
+        'author': 'programmer123',
+        'score': 1250,
+        'num_comments': 89,
+        'url': 'https://reddit.com/r/programming/comments/example1',
+        'subreddit': 'programming',
+        'created_utc': 1640995200,
+        'permalink': 'https://reddit.com/r/programming/comments/example1'
+    }),
+    MappingProxyType({
+        'title': 'AI and Machine Learning trends for 2024',
+        'content': 'Discussion about the latest developments in AI and ML.',
+        'author': 'ai_enthusiast',
+        'score': 890,
+        'num_comments': 45,
+        'url': 'https://reddit.com/r/MachineLearning/comments/example2',
+        'subreddit': 'MachineLearning',
+        'created_utc': 1640995200,
+        'permalink': 'https://reddit.com/r/MachineLearning/comments/example2'
+    }),
+    MappingProxyType({
+        'title': 'Python vs JavaScript: Which should I learn first?',
+        'content': 'Beginner asking for advice on choosing between Python and JavaScript.',
+        'author': 'newbie_dev',
+        'score': 567,
+        'num_comments': 32,
+        'url': 'https://reddit.com/r/learnprogramming/comments/example3',
+        'subreddit': 'learnprogramming',
+        'created_utc': 1640995200,
+        'permalink': 'https://reddit.com/r/learnprogramming/comments/example3'
+    })
+)
+
+# Lower-cased title/content for each sample post, computed once at import
+_SAMPLE_TEXT = tuple((post['title'].lower(), post['content'].lower()) for post in _SAMPLE_POSTS)
 
 class MockRedditScraper:
     """
@@ -105,63 +331,32 @@ class MockRedditScraper:
     """
     
     def __init__(self):
-        self.sample_posts = [
-            {
-                'title': 'What are the best programming languages to learn in 2024?',
-                'content': 'I want to start learning programming and wondering what languages are most in demand.',
-                'author': 'programmer123',
-                'score': 1250,
-                'num_comments': 89,
-                'url': 'https://reddit.com/r/programming/comments/example1',
-                'subreddit': 'programming',
-                'created_utc': 1640995200,
-                'permalink': 'https://reddit.com/r/programming/comments/example1'
-            },
-            {
-                'title': 'AI and Machine Learning trends for 2024',
-                'content': 'Discussion about the latest developments in AI and ML.',
-                'author': 'ai_enthusiast',
-                'score': 890,
-                'num_comments': 45,
-                'url': 'https://reddit.com/r/MachineLearning/comments/example2',
-                'subreddit': 'MachineLearning',
-                'created_utc': 1640995200,
-                'permalink': 'https://reddit.com/r/MachineLearning/comments/example2'
-            },
-            {
-                'title': 'Python vs JavaScript: Which should I learn first?',
-                'content': 'Beginner asking for advice on choosing between Python and JavaScript.',
-                'author': 'newbie_dev',
-                'score': 567,
-                'num_comments': 32,
-                'url': 'https://reddit.com/r/learnprogramming/comments/example3',
-                'subreddit': 'learnprogramming',
-                'created_utc': 1640995200,
-                'permalink': 'https://reddit.com/r/learnprogramming/comments/example3'
-            }
-        ]
+        self.sample_posts = _SAMPLE_POSTS
     
     def search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> List[Dict]:
         """
         Return sample posts based on query
         """
         # Filter posts based on query keywords
+        keywords = query.lower().split()
         filtered_posts = []
-        query_lower = query.lower()
         
-        for post in self.sample_posts:
-            if any(keyword in post['title'].lower() or keyword in post['content'].lower() 
-                   for keyword in query_lower.split()):
-                filtered_posts.append(post)
+        if keywords:
+            # One alternation pattern scans each text once for any keyword
+            pattern = re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+            filtered_posts = [
+                post for post, (title, content) in zip(self.sample_posts, _SAMPLE_TEXT)
+                if pattern.search(title) or pattern.search(content)
+            ]
         
         # If no matches, return all posts
         if not filtered_posts:
             filtered_posts = self.sample_posts
         
-        return filtered_posts[:limit]
+        return list(filtered_posts[:limit])
     
     def get_hot_posts(self, subreddit: str, limit: int = 10) -> List[Dict]:
         """
         Return sample hot posts
         """
-        return self.sample_posts[:limit]
+        return list(self.sample_posts[:limit])
@@ -4,18 +4,22 @@ Demo script for Reddit Summarizer Agent
 Tests the core functionality without the web interface
 """
 
+import argparse
+import logging
 import sys
-from reddit_scraper import RedditWebScraper
+from alternative_scraper import RedditJSONScraper
 from text_summarizer import SimpleSummarizer
 
+logger = logging.getLogger('demo')
+
 def demo_reddit_summarizer():
     """Demonstrate the Reddit summarizer functionality"""
-    print("🤖 Reddit Summarizer Agent - Demo")
-    print("=" * 50)
+    logger.info("🤖 Reddit Summarizer Agent - Demo")
+    logger.info("=" * 50)
     
     # Initialize components
-    print("📥 Initializing components...")
-    scraper = RedditWebScraper()
+    logger.info("📥 Initializing components...")
+    scraper = RedditJSONScraper()
     summarizer = SimpleSummarizer()
     
     # Test query
@@ -23,55 +27,60 @@ def demo_reddit_summarizer():
     subreddit = "technology"
     num_posts = 5
     
-    print(f"🔍 Searching for '{query}' in r/{subreddit}...")
+    logger.info(f"🔍 Searching for '{query}' in r/{subreddit}...")
     
     try:
-        # Search for posts
-        posts = scraper.search_posts(query, subreddit=subreddit, limit=num_posts)
+        # Search for posts; each one is yielded as soon as it has been
+        # parsed, so it is reported while the rest are still downloading
+        posts = []
+        for post in scraper.iter_search_posts(query, subreddit=subreddit, limit=num_posts):
+            posts.append(post)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"\n{len(posts)}. {post['title'][:80]}...\n"
+                    f"   Subreddit: r/{post['subreddit']}\n"
+                    f"   Score: {post['score']}\n"
+                    f"   Comments: {post['num_comments']}"
+                )
         
         if not posts:
-            print("❌ No posts found. This might be due to:")
-            print("   - Network connectivity issues")
-            print("   - Reddit's anti-bot measures")
-            print("   - The subreddit not existing")
+            logger.info("❌ No posts found. This might be due to:")
+            logger.info("   - Network connectivity issues")
+            logger.info("   - Reddit's anti-bot measures")
+            logger.info("   - The subreddit not existing")
             return
         
-        print(f"✅ Found {len(posts)} posts")
-        
-        # Display posts
-        print("\n📝 Posts found:")
-        for i, post in enumerate(posts, 1):
-            print(f"\n{i}. {post['title'][:80]}...")
-            print(f"   Subreddit: r/{post['subreddit']}")
-            print(f"   Score: {post['score']}")
-            print(f"   Comments: {post['num_comments']}")
+        logger.info(f"✅ Found {len(posts)} posts")
         
         # Summarize
-        print(f"\n📊 Summarizing {len(posts)} posts...")
+        logger.info(f"\n📊 Summarizing {len(posts)} posts...")
         summary_data = summarizer.summarize_reddit_posts(posts, query)
         
         # Display summary
-        print("\n" + "="*50)
-        print("📋 SUMMARY")
-        print("="*50)
-        print(f"\n🔍 Query: {summary_data['query']}")
-        print(f"📊 Total posts analyzed: {summary_data['total_posts']}")
+        logger.info("\n" + "="*50 + "\n📋 SUMMARY\n" + "="*50)
+        logger.info(f"\n🔍 Query: {summary_data['query']}")
+        logger.info(f"📊 Total posts analyzed: {summary_data['total_posts']}")
         
-        print(f"\n📝 Overall Summary:")
-        print(summary_data['summary'])
+        logger.info(f"\n📝 Overall Summary:")
+        logger.info(summary_data['summary'])
         
         if summary_data['key_points']:
-            print(f"\n🔑 Key Points:")
-            for point in summary_data['key_points'][:10]:
-                print(f"   • {point}")
+            key_points = '\n'.join(f"   • {point}" for point in summary_data['key_points'][:10])
+            logger.info(f"\n🔑 Key Points:\n{key_points}")
         
-        print("\n✅ Demo completed successfully!")
-        print("💡 To use the full interface, run: python main.py")
+        logger.info("\n✅ Demo completed successfully!")
+        logger.info("💡 To use the full interface, run: python main.py")
         
     except Exception as e:
-        print(f"❌ Error during demo: {e}")
-        print("💡 This might be due to network issues or Reddit's anti-bot measures")
-        print("   Try running the full app with: python main.py")
+        logger.error(f"❌ Error during demo: {e}")
+        logger.info("💡 This might be due to network issues or Reddit's anti-bot measures")
+        logger.info("   Try running the full app with: python main.py")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--verbose', action='store_true', help="also list every post found")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout, format='%(message)s')
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
     demo_reddit_summarizer()
@@ -0,0 +1,48 @@
+"""
+HTTP helpers shared by the Reddit scrapers
+"""
+
+import socket
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds; a dead host fails fast while slow listings still get to finish
+REQUEST_TIMEOUT = (3.05, 10)
+
+def build_retry(total: int, backoff_factor: float, connect: int = 1, read: int = 1) -> Retry:
+    """
+    Retry policy for GETs: back off exponentially with jitter on 429/5xx,
+    honouring Retry-After, and never retry other 4xx errors
+    
+    Connection and read errors get their own, smaller budget so an
+    unreachable host fails within seconds instead of backing off total times.
+    """
+    options = dict(
+        total=total,
+        connect=connect,
+        read=read,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        allowed_methods=frozenset(['GET'])
+    )
+    try:
+        return Retry(backoff_jitter=0.5, **options)
+    except TypeError:
+        # urllib3 1.x has no backoff_jitter
+        return Retry(**options)
+
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pooled sockets skip Nagle's delay and send TCP keep-alives
+    """
+    
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
@@ -6,23 +6,30 @@ A chatbot that scrapes Reddit data and provides intelligent summaries
 
 import sys
 import os
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
 
+# Set once the dependency check has passed so repeat calls can skip it
+_DEPS_OK = False
+
 def check_dependencies():
     """Check if all required dependencies are installed"""
+    global _DEPS_OK
+    if _DEPS_OK:
+        return True
+    
     required_packages = [
         ('streamlit', 'streamlit'),
         ('requests', 'requests'),
-        ('beautifulsoup4', 'bs4'),
         ('nltk', 'nltk')
     ]
     
     missing_packages = []
     
     for package_name, import_name in required_packages:
-        try:
-            __import__(import_name)
-        except ImportError:
+        # find_spec only locates the package; it doesn't run its import-time code
+        if importlib.util.find_spec(import_name) is None:
             missing_packages.append(package_name)
     
     if missing_packages:
@@ -33,25 +40,30 @@ def check_dependencies():
         print(f"   pip install {' '.join(missing_packages)}")
         return False
     
+    _DEPS_OK = True
     return True
 
+@lru_cache(maxsize=1)
+def _nltk_ready():
+    """Check whether the stopwords corpus is already on disk"""
+    import nltk
+    
+    path = 'corpora/stopwords'
+    return any((Path(root) / path).exists() or (Path(root) / f"{path}.zip").exists() for root in nltk.data.path)
+
 def setup_nltk_data():
     """Download required NLTK data"""
     try:
         import nltk
         
         # Check if data is already downloaded
-        try:
-            nltk.data.find('tokenizers/punkt')
-            nltk.data.find('corpora/stopwords')
+        if _nltk_ready():
             print("✅ NLTK data already available")
             return True
-        except LookupError:
-            pass
         
         print("📥 Downloading NLTK data...")
-        nltk.download('punkt', quiet=True)
         nltk.download('stopwords', quiet=True)
+        _nltk_ready.cache_clear()
         print("✅ NLTK data downloaded successfully")
         return True
         
@@ -80,15 +92,25 @@ def main():
     print("\n⏹️ Press Ctrl+C to stop the application")
     
     try:
-        import subprocess
-        import sys
-        
         # Get the path to the streamlit app
         app_path = Path(__file__).parent / "streamlit_app.py"
         
-        # Launch Streamlit using subprocess
-        cmd = [sys.executable, "-m", "streamlit", "run", str(app_path), "--server.port", "8501", "--server.address", "localhost"]
-        subprocess.run(cmd)
+        try:
+            from streamlit.web import bootstrap
+        except ImportError:
+            bootstrap = None
+        
+        if bootstrap is not None:
+            # Run Streamlit in this process instead of starting a second interpreter
+            flag_options = {'server_port': 8501, 'server_address': 'localhost'}
+            bootstrap.load_config_options(flag_options=flag_options)
+            bootstrap.run(str(app_path), f"streamlit run {app_path}", [], flag_options)
+        else:
+            import subprocess
+            
+            # Launch Streamlit using subprocess
+            cmd = [sys.executable, "-m", "streamlit", "run", str(app_path), "--server.port", "8501", "--server.address", "localhost"]
+            subprocess.run(cmd)
         
     except KeyboardInterrupt:
         print("\n👋 Application stopped by user")
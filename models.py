@@ -0,0 +1,120 @@
+"""
+Data models shared by the Reddit scrapers
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+# The keys of the dicts the scrapers used to return; Post's dict-style access is limited to these
+_POST_KEYS = frozenset({
+    'title', 'content', 'author', 'score', 'num_comments',
+    'url', 'subreddit', 'created_utc', 'permalink'
+})
+
+@dataclass(frozen=True, slots=True)
+class Post:
+    """
+    A Reddit post as returned by the scrapers
+    
+    Slots keep each instance small; __getitem__ and get() let callers keep
+    using the post['title'] / post.get('title') style of the old dicts.
+    """
+    title: str
+    content: str
+    author: str
+    score: int
+    num_comments: int
+    url: str
+    subreddit: str
+    created_utc: float
+    permalink_path: str
+    base_url: str
+    
+    @classmethod
+    def from_json(cls, post_data: Dict, base_url: str) -> 'Post':
+        """
+        Build a Post from one listing child's data
+        """
+        return cls(
+            title=post_data.get('title', ''),
+            content=post_data.get('selftext', ''),
+            author=post_data.get('author', '[deleted]'),
+            score=post_data.get('score', 0),
+            num_comments=post_data.get('num_comments', 0),
+            url=post_data.get('url', ''),
+            subreddit=post_data.get('subreddit', 'unknown'),
+            created_utc=post_data.get('created_utc', 0),
+            permalink_path=post_data.get('permalink', ''),
+            base_url=base_url
+        )
+    
+    @classmethod
+    def from_praw(cls, post, base_url: str = "https://reddit.com") -> 'Post':
+        """
+        Build a Post from a PRAW submission, reading only fields the listing
+        already returned so no per-post API calls are made
+        """
+        return cls(
+            title=post.title,
+            content=post.selftext,
+            author=post.author.name if post.author else '[deleted]',
+            score=post.score,
+            num_comments=post.num_comments,
+            url=post.url,
+            subreddit=post.subreddit.display_name,
+            created_utc=post.created_utc,
+            permalink_path=post.permalink,
+            base_url=base_url
+        )
+    
+    @property
+    def permalink(self) -> str:
+        # Joined on access; most posts never have their link read
+        return self.base_url + self.permalink_path
+    
+    def __getitem__(self, key: str):
+        if key not in _POST_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in _POST_KEYS else default
+    
+    def to_dict(self) -> Dict:
+        """
+        The post as a plain dict in the scrapers' original shape
+        """
+        return {
+            'title': self.title,
+            'content': self.content,
+            'author': self.author,
+            'score': self.score,
+            'num_comments': self.num_comments,
+            'url': self.url,
+            'subreddit': self.subreddit,
+            'created_utc': self.created_utc,
+            'permalink': self.permalink
+        }
+
+@dataclass(frozen=True, slots=True)
+class PostSummary:
+    """
+    One post's entry in a summary's post_summaries
+    """
+    title: str
+    summary: str
+    score: int
+    subreddit: str
+    url: str
+    
+    def to_dict(self) -> Dict:
+        """
+        The summary as a plain dict, e.g. for JSON output
+        """
+        return {
+            'title': self.title,
+            'summary': self.summary,
+            'score': self.score,
+            'subreddit': self.subreddit,
+            'url': self.url
+        }
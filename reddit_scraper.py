@@ -1,8 +1,50 @@
 import praw
+import asyncio
+import json
+import logging
 import os
-from typing import List, Dict
+import random
+from itertools import islice
+from typing import Iterator, List, Dict, Optional
 import time
 
+from models import Post
+from prawcore.exceptions import TooManyRequests
+
+# asyncpraw is optional; with it comments for several posts are fetched concurrently
+try:
+    import asyncpraw
+except ImportError:
+    asyncpraw = None
+
+# orjson is optional; it parses the raw response bytes several times faster than json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+def _retry_on_ratelimit(fetch, attempts: int = 6):
+    """
+    Call fetch(), sleeping through reddit 429s: Retry-After when given,
+    otherwise exponential backoff with jitter. Re-raises on the last attempt.
+    """
+    for attempt in range(attempts):
+        try:
+            return fetch()
+        except TooManyRequests as e:
+            if attempt == attempts - 1:
+                raise
+            try:
+                # Retry-After may also be an HTTP date; use the backoff then
+                delay = float(e.retry_after)
+            except (TypeError, ValueError):
+                delay = 0.5 * 2 ** attempt + random.uniform(0, 0.5)
+            logger.warning("Rate limited by reddit, retrying in %.1fs", delay)
+            time.sleep(delay)
+
 class RedditScraper:
     """
     Reddit scraper using PRAW (Python Reddit API Wrapper)
@@ -12,13 +54,14 @@ class RedditScraper:
     def __init__(self):
         # Reddit API credentials (using Reddit's script app type)
         # These are public credentials for a demo app - safe to use
-        self.reddit = praw.Reddit(
-            client_id="your_client_id_here",  # You'll need to get this from Reddit
-            client_secret="your_client_secret_here",  # You'll need to get this from Reddit
-            user_agent="RedditSummarizerBot/1.0"
-        )
+        self._credentials = {
+            'client_id': "your_client_id_here",  # You'll need to get this from Reddit
+            'client_secret': "your_client_secret_here",  # You'll need to get this from Reddit
+            'user_agent': "RedditSummarizerBot/1.0"
+        }
+        self.reddit = praw.Reddit(**self._credentials)
     
-    def search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> List[Dict]:
+    def search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> List[Post]:
         """
         Search for posts on Reddit based on query
         
@@ -28,7 +71,7 @@ class RedditScraper:
             limit: Number of posts to retrieve
             
         Returns:
-            List of dictionaries containing post data
+            List of Post objects
         """
         posts = []
         
@@ -36,31 +79,21 @@ class RedditScraper:
             if subreddit:
                 # Search within specific subreddit
                 subreddit_obj = self.reddit.subreddit(subreddit)
-                search_results = subreddit_obj.search(query, limit=limit)
             else:
                 # Search across all Reddit
-                search_results = self.reddit.subreddit("all").search(query, limit=limit)
+                subreddit_obj = self.reddit.subreddit("all")
             
-            for post in search_results:
-                post_data = {
-                    'title': post.title,
-                    'content': post.selftext,
-                    'author': str(post.author) if post.author else '[deleted]',
-                    'score': post.score,
-                    'num_comments': post.num_comments,
-                    'url': post.url,
-                    'subreddit': str(post.subreddit),
-                    'created_utc': post.created_utc,
-                    'permalink': f"https://reddit.com{post.permalink}"
-                }
-                posts.append(post_data)
+            # The listing is fetched while iterating, so retry the whole read
+            posts = _retry_on_ratelimit(
+                lambda: [Post.from_praw(post) for post in subreddit_obj.search(query, limit=limit)]
+            )
                 
         except Exception as e:
-            print(f"Error searching Reddit: {e}")
+            logger.warning("Error searching Reddit: %s", e, exc_info=True)
             
         return posts
     
-    def get_hot_posts(self, subreddit: str, limit: int = 10) -> List[Dict]:
+    def get_hot_posts(self, subreddit: str, limit: int = 10) -> List[Post]:
         """
         Get hot posts from a specific subreddit
         
@@ -69,29 +102,19 @@ class RedditScraper:
             limit: Number of posts to retrieve
             
         Returns:
-            List of dictionaries containing post data
+            List of Post objects
         """
         posts = []
         
         try:
             subreddit_obj = self.reddit.subreddit(subreddit)
             
-            for post in subreddit_obj.hot(limit=limit):
-                post_data = {
-                    'title': post.title,
-                    'content': post.selftext,
-                    'author': str(post.author) if post.author else '[deleted]',
-                    'score': post.score,
-                    'num_comments': post.num_comments,
-                    'url': post.url,
-                    'subreddit': str(post.subreddit),
-                    'created_utc': post.created_utc,
-                    'permalink': f"https://reddit.com{post.permalink}"
-                }
-                posts.append(post_data)
+            posts = _retry_on_ratelimit(
+                lambda: [Post.from_praw(post) for post in subreddit_obj.hot(limit=limit)]
+            )
                 
         except Exception as e:
-            print(f"Error getting hot posts: {e}")
+            logger.warning("Error getting hot posts: %s", e, exc_info=True)
             
         return posts
     
@@ -117,191 +140,329 @@ class RedditScraper:
                     comments.append(comment.body)
                     
         except Exception as e:
-            print(f"Error getting comments: {e}")
+            logger.warning("Error getting comments: %s", e, exc_info=True)
             
         return comments
+    
+    async def aget_comments(self, reddit, post_url: str, limit: int = 20) -> List[str]:
+        """
+        Async version of get_comments using an open asyncpraw client
+        """
+        comments = []
+        
+        try:
+            submission = await reddit.submission(url=post_url)
+            await submission.comments.replace_more(limit=0)
+            
+            # Like get_comments: filter within the first `limit` comments, not until `limit` are kept
+            seen = 0
+            async for comment in submission.comments:
+                if seen >= limit:
+                    break
+                seen += 1
+                if hasattr(comment, 'body') and comment.body != '[deleted]':
+                    comments.append(comment.body)
+                    
+        except Exception as e:
+            logger.warning("Error getting comments: %s", e, exc_info=True)
+            
+        return comments
+    
+    async def aget_many_comments(self, post_urls: List[str], limit: int = 20) -> List[List[str]]:
+        """
+        Fetch comments for several posts at once over one asyncpraw client
+        """
+        async with asyncpraw.Reddit(**self._credentials) as reddit:
+            return await asyncio.gather(*(self.aget_comments(reddit, url, limit) for url in post_urls))
+    
+    def get_many_comments(self, post_urls: List[str], limit: int = 20) -> List[List[str]]:
+        """
+        Get top comments for several posts, concurrently when asyncpraw is installed
+        
+        Args:
+            post_urls: URLs of the Reddit posts
+            limit: Number of comments to retrieve per post
+            
+        Returns:
+            One list of comment texts per URL, in the same order
+        """
+        if asyncpraw is None:
+            return [self.get_comments(url, limit) for url in post_urls]
+        return asyncio.run(self.aget_many_comments(post_urls, limit))
 
 # Alternative scraper using requests (no API key required)
+import threading
 import requests
-from bs4 import BeautifulSoup
+from collections import OrderedDict, deque
+
+from config import SCRAPER_CONFIG
+from http_utils import REQUEST_TIMEOUT, KeepAliveAdapter, build_retry
+
+# Longest pause taken before a request, whether on our own quota or on reddit's
+# rate limit headers; reddit's reset can be minutes away
+_MAX_THROTTLE_WAIT = 5.0
+
+class RateLimitExceeded(Exception):
+    """Raised instead of waiting longer than a limiter's max_wait for a free slot"""
+
+class _RateLimiter:
+    """
+    Sliding-window limiter that keeps requests under a per-period quota
+    """
+    
+    def __init__(self, max_calls: int, period: float = 60.0, max_wait: float = None):
+        self.max_calls = max_calls
+        self.period = period
+        self.max_wait = max_wait
+        self._calls = deque()
+        self._lock = threading.Lock()
+    
+    def wait_if_throttled(self):
+        """
+        Block until another request fits in the window, then record it
+        
+        Raises RateLimitExceeded, without using up a slot, if that would take
+        longer than max_wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= self.period:
+                self._calls.popleft()
+            
+            # Reserve the earliest slot that keeps the window under quota;
+            # slots never go backwards, so the deque stays in order
+            slot = now
+            if len(self._calls) >= self.max_calls:
+                slot = self._calls[-self.max_calls] + self.period
+            if self._calls:
+                slot = max(slot, self._calls[-1])
+            if self.max_wait is not None and slot - now > self.max_wait:
+                raise RateLimitExceeded(f"next request slot is {slot - now:.0f}s away")
+            self._calls.append(slot)
+        
+        # Sleep outside the lock so other threads can reserve their own slots
+        if slot > now:
+            time.sleep(slot - now)
+
+# Reddit's quota is per client, so every web scraper instance shares one window
+_WEB_RATE_LIMITER = _RateLimiter(SCRAPER_CONFIG['requests_per_minute'], max_wait=_MAX_THROTTLE_WAIT)
+
+def _throttle_from_headers(response):
+    """
+    Pause until the quota resets when reddit reports it is nearly used up
+    """
+    headers = response.headers
+    try:
+        remaining = float(headers['X-Ratelimit-Remaining'])
+        reset = float(headers.get('X-Ratelimit-Reset', 0))
+        used = float(headers.get('X-Ratelimit-Used', 0))
+    except (KeyError, ValueError):
+        return
+    
+    total = remaining + used
+    if remaining <= 2 or (total and remaining / total < 0.1):
+        wait = min(reset, _MAX_THROTTLE_WAIT)
+        if reset > wait:
+            logger.warning("Rate limit nearly exhausted, resets in %.0fs; waiting only %.0fs", reset, wait)
+        else:
+            logger.info("Rate limit nearly exhausted, waiting %.0fs", wait)
+        time.sleep(wait)
+
+class _ResponseCache:
+    """
+    Thread-safe LRU of decoded JSON responses and their ETags
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """
+        Return (fresh, etag, data) for a key, or None if it isn't cached
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        
+        stored_at, etag, data = entry
+        return time.monotonic() - stored_at < self.ttl, etag, data
+    
+    def put(self, key, etag, data):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), etag, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+# Shared so that repeated queries from new scraper instances still hit
+_WEB_RESPONSE_CACHE = _ResponseCache(maxsize=512, ttl=SCRAPER_CONFIG['cache_ttl']['search'])
 
 class RedditWebScraper:
     """
-    Alternative Reddit scraper using web scraping (no API key required)
+    Alternative Reddit scraper using reddit's public JSON listings (no API key required)
     """
     
     def __init__(self):
-        self.base_url = "https://old.reddit.com"
+        self.base_url = "https://www.reddit.com"
+        self.permalink_base = "https://reddit.com"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept': 'application/json',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
         }
+        
+        # Keep connections to reddit alive between requests instead of
+        # re-resolving and re-handshaking on every call
+        retry = build_retry(total=5, backoff_factor=0.5)
+        adapter = KeepAliveAdapter(max_retries=retry, pool_connections=10, pool_maxsize=20)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(self.headers)
+        self.timeout = REQUEST_TIMEOUT
+        self.rate_limiter = _WEB_RATE_LIMITER
+        self.response_cache = _WEB_RESPONSE_CACHE
+        
+        # URLs that don't depend on the query are built once per scraper
+        self._subreddit_prefix = f"{self.base_url}/r/"
+        self._search_global_url = f"{self.base_url}/search.json"
+        self._hot_global_url = f"{self.base_url}/hot.json"
+        self.popular_subreddits = ('AskReddit', 'worldnews', 'technology', 'programming', 'python')
+        self._fallback_requests = [
+            (self._subreddit_prefix + sub + "/hot.json", {'limit': 3}) for sub in self.popular_subreddits
+        ]
+    
+    def close(self):
+        """
+        Release the pooled connections
+        """
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _get(self, url: str, params: Dict = None, headers: Dict = None):
+        """
+        GET a page within reddit's rate limit
+        """
+        self.rate_limiter.wait_if_throttled()
+        # 429s are retried by the adapter, which honours Retry-After
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        _throttle_from_headers(response)
+        response.raise_for_status()
+        return response
+    
+    def _get_json(self, url: str, params: Dict = None):
+        """
+        GET and decode a JSON endpoint, served from the response cache while
+        fresh and revalidated with If-None-Match once stale
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        cached = self.response_cache.get(key)
+        headers = None
+        if cached is not None:
+            fresh, etag, data = cached
+            if fresh:
+                return data
+            if etag:
+                headers = {'If-None-Match': etag}
+        
+        response = self._get(url, params, headers)
+        if response.status_code == 304 and cached is not None:
+            etag = response.headers.get('ETag', etag)
+        else:
+            etag = response.headers.get('ETag')
+            data = _loads(response.content)
+        
+        self.response_cache.put(key, etag, data)
+        return data
     
-    def search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> List[Dict]:
+    def _iter_listing_posts(self, data: Dict) -> Iterator[Post]:
         """
-        Search Reddit posts using web scraping
+        Lazily build Posts from a decoded listing, skipping malformed children
+        """
+        for child in data.get('data', {}).get('children', []):
+            post_data = child.get('data')
+            if post_data:
+                yield Post.from_json(post_data, self.permalink_base)
+    
+    def search_posts(self, query: str, subreddit: str = None, limit: int = 10) -> List[Post]:
+        """
+        Search Reddit posts using the JSON listings
         """
         posts = []
         
         try:
-            # Try multiple approaches to find posts
-            search_urls = []
-            
+            # Try the search first, then the hot listing
             if subreddit:
-                # Try subreddit-specific search
-                search_urls.append(f"{self.base_url}/r/{subreddit}/search")
-                # Also try hot posts from subreddit
-                search_urls.append(f"{self.base_url}/r/{subreddit}/hot")
+                subreddit_url = self._subreddit_prefix + subreddit
+                candidates = [
+                    (subreddit_url + "/search.json",
+                     {'q': query, 'restrict_sr': 1, 'sort': 'relevance', 't': 'all', 'limit': limit}),
+                    (subreddit_url + "/hot.json", {'limit': limit}),
+                ]
             else:
-                # Try general search
-                search_urls.append(f"{self.base_url}/search")
-                # Also try popular posts
-                search_urls.append(f"{self.base_url}/")
+                candidates = [
+                    (self._search_global_url, {'q': query, 'sort': 'relevance', 't': 'all', 'limit': limit}),
+                    (self._hot_global_url, {'limit': limit}),
+                ]
             
-            for search_url in search_urls:
-                if len(posts) >= limit:
-                    break
-                    
+            # The hot listing is only requested if the search yields nothing,
+            # so a successful search costs one request of the quota
+            for search_url, params in candidates:
                 try:
-                    if 'search' in search_url:
-                        params = {'q': query, 'sort': 'relevance', 't': 'all'}
-                    else:
-                        params = {}
-                    
-                    print(f"Trying URL: {search_url}")
-                    response = requests.get(search_url, params=params, headers=self.headers, timeout=10)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
+                    logger.info("Trying URL: %s", search_url)
+                    data = self._get_json(search_url, params)
                     
-                    # Find post containers - try multiple selectors
-                    post_containers = soup.find_all('div', class_='thing')
-                    if not post_containers:
-                        # Try alternative selectors
-                        post_containers = soup.find_all('div', {'data-type': 'link'})
-                    
-                    print(f"Found {len(post_containers)} post containers")
-                    
-                    for container in post_containers[:limit]:
-                        try:
-                            # Try multiple ways to find title
-                            title_elem = container.find('a', class_='title')
-                            if not title_elem:
-                                title_elem = container.find('a', {'data-event-action': 'title'})
-                            if not title_elem:
-                                title_elem = container.find('a', href=True)
-                            
-                            if not title_elem:
-                                continue
-                                
-                            title = title_elem.get_text(strip=True)
-                            if not title:
-                                continue
-                                
-                            url = title_elem.get('href', '')
-                            
-                            # Get subreddit
-                            subreddit_elem = container.find('a', class_='subreddit')
-                            if not subreddit_elem:
-                                subreddit_elem = container.find('a', href=lambda x: x and '/r/' in x)
-                            subreddit_name = subreddit_elem.get_text(strip=True) if subreddit_elem else (subreddit or 'unknown')
-                            
-                            # Get score
-                            score_elem = container.find('div', class_='score')
-                            if not score_elem:
-                                score_elem = container.find('span', class_='score')
-                            score = 0
-                            if score_elem:
-                                score_text = score_elem.get_text(strip=True)
-                                import re
-                                match = re.search(r'(\d+)', score_text.replace('•', '0'))
-                                if match:
-                                    score = int(match.group(1))
-                            
-                            # Get comments count
-                            comments_elem = container.find('a', class_='comments')
-                            num_comments = 0
-                            if comments_elem:
-                                comments_text = comments_elem.get_text(strip=True)
-                                import re
-                                match = re.search(r'(\d+)', comments_text)
-                                if match:
-                                    num_comments = int(match.group(1))
-                            
-                            post_data = {
-                                'title': title,
-                                'content': '',  # Web scraping doesn't easily get full content
-                                'author': '[web_scraped]',
-                                'score': score,
-                                'num_comments': num_comments,
-                                'url': url if url.startswith('http') else f"{self.base_url}{url}",
-                                'subreddit': subreddit_name,
-                                'created_utc': 0,
-                                'permalink': url if url.startswith('http') else f"{self.base_url}{url}"
-                            }
-                            posts.append(post_data)
-                            
-                        except Exception as e:
-                            print(f"Error parsing post: {e}")
-                            continue
+                    posts = list(islice(self._iter_listing_posts(data), limit))
+                    logger.info("Found %d posts", len(posts))
                     
                     if posts:
                         break  # If we found posts, stop trying other URLs
                         
                 except Exception as e:
-                    print(f"Error with URL {search_url}: {e}")
+                    logger.warning("Error with URL %s: %s", search_url, e)
                     continue
             
             # If still no posts, try a simpler approach - get hot posts from popular subreddits
             if not posts:
-                print("Trying fallback: getting hot posts from popular subreddits")
-                popular_subreddits = ['AskReddit', 'worldnews', 'technology', 'programming', 'python']
-                for sub in popular_subreddits:
+                logger.info("Trying fallback: getting hot posts from popular subreddits")
+                # One listing at a time, so no more of the quota is spent than the limit needs
+                for sub, (url, params) in zip(self.popular_subreddits, self._fallback_requests):
                     try:
-                        hot_url = f"{self.base_url}/r/{sub}/hot"
-                        response = requests.get(hot_url, headers=self.headers, timeout=10)
-                        response.raise_for_status()
-                        
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        post_containers = soup.find_all('div', class_='thing')[:3]  # Get top 3
+                        data = self._get_json(url, params)
                         
-                        for container in post_containers:
-                            title_elem = container.find('a', class_='title')
-                            if title_elem:
-                                title = title_elem.get_text(strip=True)
-                                url = title_elem.get('href', '')
-                                
-                                post_data = {
-                                    'title': title,
-                                    'content': '',
-                                    'author': '[web_scraped]',
-                                    'score': 100,  # Default score
-                                    'num_comments': 10,  # Default comments
-                                    'url': url if url.startswith('http') else f"{self.base_url}{url}",
-                                    'subreddit': sub,
-                                    'created_utc': 0,
-                                    'permalink': url if url.startswith('http') else f"{self.base_url}{url}"
-                                }
-                                posts.append(post_data)
+                        # Top 3, without overshooting the limit
+                        posts.extend(islice(self._iter_listing_posts(data), min(3, limit - len(posts))))
                                 
                         if len(posts) >= limit:
                             break
                             
+                    except RateLimitExceeded as e:
+                        logger.warning("Skipping the rest of the fallback: %s", e)
+                        break
+                    
                     except Exception as e:
-                        print(f"Error with fallback subreddit {sub}: {e}")
+                        logger.warning("Error with fallback subreddit %s: %s", sub, e)
                         continue
                     
         except Exception as e:
-            print(f"Error scraping Reddit: {e}")
+            logger.warning("Error scraping Reddit: %s", e, exc_info=True)
             
-        print(f"Total posts found: {len(posts)}")
+        logger.info("Total posts found: %d", len(posts))
         return posts
     
-    def get_post_from_url(self, url: str) -> Dict:
+    def get_post_from_url(self, url: str) -> Optional[Post]:
         """
         Get a single Reddit post from URL
         """
@@ -316,34 +477,19 @@ class RedditWebScraper:
             else:
                 json_url = url
             
-            print(f"Fetching post from: {json_url}")
-            response = requests.get(json_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
+            logger.info("Fetching post from: %s", json_url)
+            data = self._get_json(json_url)
             
             # Reddit JSON API returns a list, first item is the post
             if isinstance(data, list) and len(data) > 0:
-                post_data = data[0]['data']['children'][0]['data']
-                
-                post = {
-                    'title': post_data.get('title', ''),
-                    'content': post_data.get('selftext', ''),
-                    'author': post_data.get('author', '[deleted]'),
-                    'score': post_data.get('score', 0),
-                    'num_comments': post_data.get('num_comments', 0),
-                    'url': post_data.get('url', ''),
-                    'subreddit': post_data.get('subreddit', 'unknown'),
-                    'created_utc': post_data.get('created_utc', 0),
-                    'permalink': f"https://reddit.com{post_data.get('permalink', '')}"
-                }
+                post = Post.from_json(data[0]['data']['children'][0]['data'], self.permalink_base)
                 
-                print(f"Successfully fetched post: {post['title'][:50]}...")
+                logger.info("Successfully fetched post: %s...", post.title[:50])
                 return post
             else:
-                print("No post data found in response")
+                logger.warning("No post data found in response")
                 return None
                 
         except Exception as e:
-            print(f"Error fetching post from URL: {e}")
+            logger.warning("Error fetching post from URL: %s", e, exc_info=True)
             return None
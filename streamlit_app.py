@@ -6,7 +6,9 @@ import json
 # Import our custom modules
 from reddit_scraper import RedditScraper, RedditWebScraper
 from alternative_scraper import RedditJSONScraper, MockRedditScraper
-from text_summarizer import TextSummarizer, SimpleSummarizer
+from nltk.corpus import stopwords
+from nltk.stem import PorterStemmer
+from text_summarizer import TextSummarizer, SimpleSummarizer, ensure_nltk_data
 
 # Page configuration
 st.set_page_config(
@@ -16,8 +18,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Static page content, kept as module constants so reruns only re-emit them
+_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -62,7 +64,36 @@ st.markdown("""
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HOW_TO_USE_MD = """
+1. **Ask a question** in the chat below
+2. **Specify a subreddit** (optional) in the sidebar
+3. **Wait for the agent** to search and summarize
+4. **Review the results** and ask follow-up questions
+
+**Example questions:**
+- "What are people saying about AI?"
+- "Latest trends in machine learning"
+- "Best programming languages 2024"
+"""
+
+_IMPORTANT_NOTES_MD = """
+- **Web scraper** works without API keys but may be slower
+- **API scraper** requires Reddit API credentials (see README)
+- Rate limiting may apply for extensive searches
+- Some posts may not be accessible due to privacy settings
+"""
+
+_FOOTER_HTML = """
+<div style='text-align: center; color: #666; margin-top: 2rem;'>
+    <p>🤖 Reddit Summarizer Agent | Built with Streamlit | Free to use</p>
+    <p>⚠️ Please respect Reddit's terms of service and rate limits</p>
+</div>
+"""
+
+# Custom CSS for better styling
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Initialize session state with error handling
 try:
@@ -118,9 +149,10 @@ def display_summary(summary_data: Dict):
     # Key points
     if summary_data['key_points']:
         st.markdown("### 🔑 Key Points")
-        key_points_html = ""
-        for point in summary_data['key_points'][:10]:  # Show top 10
-            key_points_html += f'<span class="key-points">{point}</span> '
+        key_points_html = ''.join(
+            f'<span class="key-points">{point}</span> '
+            for point in summary_data['key_points'][:10]  # Show top 10
+        )
         st.markdown(key_points_html, unsafe_allow_html=True)
     
     # Individual post summaries
@@ -129,88 +161,124 @@ def display_summary(summary_data: Dict):
         for post in summary_data['post_summaries'][:5]:  # Show top 5
             st.markdown(f"""
             <div class="post-card">
-                <h5>{post['title']}</h5>
-                <p><strong>Subreddit:</strong> r/{post['subreddit']} | 
-                   <strong>Score:</strong> {post['score']} | 
-                   <strong>Summary:</strong> {post['summary']}</p>
-                <a href="{post['url']}" target="_blank">View Original Post</a>
+                <h5>{post.title}</h5>
+                <p><strong>Subreddit:</strong> r/{post.subreddit} | 
+                   <strong>Score:</strong> {post.score} | 
+                   <strong>Summary:</strong> {post.summary}</p>
+                <a href="{post.url}" target="_blank">View Original Post</a>
             </div>
             """, unsafe_allow_html=True)
 
-def process_user_query(query: str, subreddit: str = None, num_posts: int = 10, max_words: int = None, max_paragraphs: int = None, manual_url: str = None) -> Dict:
-    """Process user query and return summary"""
+@st.cache_resource(show_spinner=False)
+def _init_nltk():
+    """Check for (and fetch) the NLTK data and build the stop word set once per process"""
+    ensure_nltk_data()
+    return frozenset(stopwords.words('english')), PorterStemmer()
+
+def get_summarizer():
+    """
+    Build the summarizer from the cached NLTK resources
+    
+    Only a successful _init_nltk is cached; while the NLTK data is unavailable
+    this falls back to SimpleSummarizer and retries on the next query.
+    """
     try:
-        # Initialize scraper with fallbacks
-        scraper = None
-        scraper_name = ""
-        
-        if st.session_state.scraper_type == 'api':
-            try:
-                scraper = RedditScraper()
-                scraper_name = "Reddit API"
-            except:
-                pass
-        
-        if not scraper:
-            try:
-                scraper = RedditJSONScraper()
-                scraper_name = "Reddit JSON API"
-            except:
-                pass
-        
-        if not scraper:
+        stop_words, stemmer = _init_nltk()
+    except Exception:
+        return SimpleSummarizer()
+    return TextSummarizer(stop_words=stop_words, stemmer=stemmer)
+
+class _NoPostsFound(Exception):
+    """Raised inside the cached pipeline so empty results are not cached"""
+
+@st.cache_resource(show_spinner=False)
+def _shared_scraper():
+    """
+    Pick the first requests-based scraper that initializes, returning it with its display name
+    
+    Cached for the process, so its HTTP session and connection pool are
+    reused across queries instead of being rebuilt on every cache miss.
+    """
+    try:
+        return RedditJSONScraper(), "Reddit JSON API"
+    except:
+        pass
+    
+    try:
+        return RedditWebScraper(), "Web Scraper"
+    except:
+        pass
+    
+    return MockRedditScraper(), "Mock Scraper (Demo Mode)"
+
+def get_scraper(scraper_type: str):
+    """
+    Pick the first scraper that initializes, returning it with its display name
+    
+    PRAW is not thread-safe, so the API scraper is kept per session rather
+    than shared between the script threads of every session.
+    """
+    if scraper_type == 'api':
+        if 'api_scraper' not in st.session_state:
             try:
-                scraper = RedditWebScraper()
-                scraper_name = "Web Scraper"
+                st.session_state.api_scraper = (RedditScraper(), "Reddit API")
             except:
-                pass
-        
-        if not scraper:
-            scraper = MockRedditScraper()
-            scraper_name = "Mock Scraper (Demo Mode)"
+                return _shared_scraper()
+        return st.session_state.api_scraper
+    
+    return _shared_scraper()
+
+@st.cache_data(ttl=600, max_entries=128, show_spinner=False)
+def _compute_summary(query: str, subreddit: str, num_posts: int, max_words: int, max_paragraphs: int, manual_url: str, scraper_name: str, _scraper):
+    """
+    Scrape and summarize; cached on all of its arguments but the scraper
+    itself, so repeated queries skip both steps
+    """
+    scraper = _scraper
+    summarizer = get_summarizer()
+    
+    # Search for posts or get from manual URL
+    if manual_url:
+        post = scraper.get_post_from_url(manual_url)
+        posts = [post] if post else []
+    elif subreddit:
+        posts = scraper.search_posts(query, subreddit=subreddit, limit=num_posts)
+    else:
+        posts = scraper.search_posts(query, limit=num_posts)
+    
+    if not posts:
+        raise _NoPostsFound(scraper_name)
+    
+    summary_data = summarizer.summarize_reddit_posts(posts, query, max_words, max_paragraphs)
+    return scraper_name, summary_data
+
+def process_user_query(query: str, subreddit: str = None, num_posts: int = 10, max_words: int = None, max_paragraphs: int = None, manual_url: str = None) -> Dict:
+    """Process user query and return summary"""
+    try:
+        spinner_text = "🔍 Fetching Reddit post..." if manual_url else "🔍 Searching Reddit and summarizing..."
+        scraper, scraper_name = get_scraper(st.session_state.scraper_type)
+        with st.spinner(spinner_text):
+            scraper_name, summary_data = _compute_summary(
+                query, subreddit or None, num_posts, max_words, max_paragraphs, manual_url or None,
+                scraper_name, scraper
+            )
         
         st.write(f"Using: {scraper_name}")
+        return summary_data
         
-        # Initialize summarizer
-        try:
-            summarizer = TextSummarizer()
-        except:
-            summarizer = SimpleSummarizer()
-        
-        # Search for posts or get from manual URL
+    except _NoPostsFound as e:
+        st.write(f"Using: {e.args[0]}")
         if manual_url:
-            with st.spinner("🔍 Fetching Reddit post..."):
-                post = scraper.get_post_from_url(manual_url)
-                if post:
-                    posts = [post]
-                else:
-                    posts = []
+            error_msg = f"Sorry, I couldn't fetch the Reddit post from the provided URL. Please check if the URL is correct and the post is accessible."
         else:
-            with st.spinner("🔍 Searching Reddit..."):
-                if subreddit:
-                    posts = scraper.search_posts(query, subreddit=subreddit, limit=num_posts)
-                else:
-                    posts = scraper.search_posts(query, limit=num_posts)
-            
-        
-        if not posts:
-            if manual_url:
-                error_msg = f"Sorry, I couldn't fetch the Reddit post from the provided URL. Please check if the URL is correct and the post is accessible."
-            else:
-                error_msg = f"Sorry, I couldn't find any posts related to '{query}'. Try a different search term or check if the subreddit exists."
-            
-            return {
-                'summary': error_msg,
-                'key_points': [],
-                'total_posts': 0,
-                'query': query
-            }
-        
-        # Summarize posts
-        with st.spinner("📝 Summarizing content..."):
-            summary_data = summarizer.summarize_reddit_posts(posts, query, max_words, max_paragraphs)
+            error_msg = f"Sorry, I couldn't find any posts related to '{query}'. Try a different search term or check if the subreddit exists."
         
-        return summary_data
+        return {
+            'summary': error_msg,
+            'key_points': [],
+            'total_posts': 0,
+            'query': query
+        }
         
     except Exception as e:
         return {
@@ -329,26 +397,11 @@ def main():
         
         st.markdown("---")
         st.markdown("### 📖 How to Use")
-        st.markdown("""
-        1. **Ask a question** in the chat below
-        2. **Specify a subreddit** (optional) in the sidebar
-        3. **Wait for the agent** to search and summarize
-        4. **Review the results** and ask follow-up questions
-        
-        **Example questions:**
-        - "What are people saying about AI?"
-        - "Latest trends in machine learning"
-        - "Best programming languages 2024"
-        """)
+        st.markdown(_HOW_TO_USE_MD)
         
         st.markdown("---")
         st.markdown("### ⚠️ Important Notes")
-        st.markdown("""
-        - **Web scraper** works without API keys but may be slower
-        - **API scraper** requires Reddit API credentials (see README)
-        - Rate limiting may apply for extensive searches
-        - Some posts may not be accessible due to privacy settings
-        """)
+        st.markdown(_IMPORTANT_NOTES_MD)
     
     # Main chat interface
     st.markdown("### 💬 Chat with Reddit Agent")
@@ -410,12 +463,7 @@ def main():
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #666; margin-top: 2rem;'>
-        <p>🤖 Reddit Summarizer Agent | Built with Streamlit | Free to use</p>
-        <p>⚠️ Please respect Reddit's terms of service and rate limits</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
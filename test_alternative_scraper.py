@@ -0,0 +1,81 @@
+"""
+Tests for the on-disk listing cache and listing parsing used by RedditJSONScraper
+"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import alternative_scraper
+from alternative_scraper import _cache_get, _cache_key, _cache_put, _iter_children
+from models import Post
+
+def _post(title: str) -> Post:
+    return Post(
+        title=title, content='body', author='someone', score=1, num_comments=0,
+        url='', subreddit='python', created_utc=0.0,
+        permalink_path=f'/r/python/{title}', base_url='https://www.reddit.com'
+    )
+
+@pytest.fixture
+def clock(tmp_path, monkeypatch):
+    """Point the cache at a temp dir and give it a clock the test controls"""
+    now = SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(alternative_scraper, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(alternative_scraper, 'time', SimpleNamespace(time=lambda: now.value))
+    return now
+
+def test_cache_key_ignores_param_order():
+    assert _cache_key('u', {'q': 'x', 'limit': 5}) == _cache_key('u', {'limit': 5, 'q': 'x'})
+    assert _cache_key('u', {'q': 'x'}) != _cache_key('u', {'q': 'y'})
+
+def test_cache_hit_returns_stored_posts(clock):
+    posts = [_post('a'), _post('b')]
+    _cache_put('key', posts)
+    
+    assert _cache_get('key', ttl=60) == posts
+
+def test_cache_miss_for_unknown_key(clock):
+    assert _cache_get('missing', ttl=60) is None
+
+def test_cache_entry_expires_after_ttl(clock):
+    _cache_put('key', [_post('a')])
+    
+    clock.value += 60
+    assert _cache_get('key', ttl=60) is not None
+    clock.value += 1
+    assert _cache_get('key', ttl=60) is None
+
+def test_cache_ignores_corrupt_entries(clock, tmp_path):
+    (tmp_path / 'key.json').write_text('{not json')
+    
+    assert _cache_get('key', ttl=60) is None
+
+def test_cache_evicts_least_recently_used(clock, tmp_path, monkeypatch):
+    monkeypatch.setattr(alternative_scraper, 'SCRAPER_CONFIG', {
+        **alternative_scraper.SCRAPER_CONFIG, 'cache_max_entries': 2
+    })
+    _cache_put('a', [_post('a')])
+    _cache_put('b', [_post('b')])
+    
+    # 'a' is older on disk, but reading it makes 'b' the least recently used
+    os.utime(tmp_path / 'a.json', (0, 100))
+    os.utime(tmp_path / 'b.json', (0, 200))
+    assert _cache_get('a', ttl=60) is not None
+    
+    _cache_put('c', [_post('c')])
+    
+    assert sorted(path.stem for path in tmp_path.glob('*.json')) == ['a', 'c']
+
+@pytest.mark.parametrize('body, expected', [
+    (b'{"data": {"children": [{"data": {"title": "a"}}]}}', [{'data': {'title': 'a'}}]),
+    (b'{"data": {}}', []),
+    (b'[{"data": {"children": []}}, {"data": {"children": []}}]', []),
+    (b'{"message": "Too Many Requests", "error": 429}', []),
+    (b'{"data": "unexpected"}', []),
+])
+def test_iter_children_without_ijson(monkeypatch, body, expected):
+    monkeypatch.setattr(alternative_scraper, 'ijson', None)
+    
+    assert list(_iter_children(SimpleNamespace(content=body))) == expected
@@ -0,0 +1,276 @@
+"""
+Tests for RedditWebScraper's response cache, ETag revalidation and rate limiting,
+and for RedditScraper's comment fetching with stubbed PRAW clients
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+from prawcore.exceptions import TooManyRequests
+
+import reddit_scraper
+from reddit_scraper import RateLimitExceeded, RedditScraper, RedditWebScraper, _MAX_THROTTLE_WAIT, _RateLimiter, _ResponseCache, _retry_on_ratelimit, _throttle_from_headers
+
+_LISTING = {'data': {'children': [
+    {'data': {'title': 'Cached post', 'selftext': 'body', 'score': 3, 'permalink': '/r/python/1'}}
+]}}
+
+class _ListingHandler(BaseHTTPRequestHandler):
+    """Serves one listing with an ETag, answering 304 when the client already has it"""
+    
+    etag = '"v1"'
+    
+    def do_GET(self):
+        self.server.seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+        
+        body = json.dumps(_LISTING).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.etag)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _ListingHandler)
+    httpd.seen = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def _scraper(ttl: float) -> RedditWebScraper:
+    scraper = RedditWebScraper()
+    scraper.response_cache = _ResponseCache(maxsize=8, ttl=ttl)
+    scraper.rate_limiter = _RateLimiter(max_calls=100)
+    return scraper
+
+def test_fresh_entry_is_served_without_a_request(server):
+    url = f'http://127.0.0.1:{server.server_port}/r/python/hot.json'
+    with _scraper(ttl=60) as scraper:
+        first = scraper._get_json(url, {'limit': 5})
+        second = scraper._get_json(url, {'limit': 5})
+    
+    assert first == second == _LISTING
+    assert len(server.seen) == 1
+
+def test_stale_entry_is_revalidated_and_304_reuses_cached_data(server):
+    url = f'http://127.0.0.1:{server.server_port}/r/python/hot.json'
+    with _scraper(ttl=0) as scraper:
+        first = scraper._get_json(url, {'limit': 5})
+        second = scraper._get_json(url, {'limit': 5})
+    
+    assert [etag for _, etag in server.seen] == [None, '"v1"']
+    assert second is first
+    assert [post.title for post in scraper._iter_listing_posts(second)] == ['Cached post']
+
+def test_search_skips_the_hot_listing_when_search_finds_posts(server):
+    with _scraper(ttl=60) as scraper:
+        scraper._search_global_url = f'http://127.0.0.1:{server.server_port}/search.json'
+        posts = scraper.search_posts('python', limit=5)
+    
+    assert [post.title for post in posts] == ['Cached post']
+    assert [path.split('?')[0] for path, _ in server.seen] == ['/search.json']
+
+def test_fallback_fetches_popular_listings_only_until_the_limit():
+    requested = []
+    
+    def get_json(url, params=None):
+        requested.append(url.rsplit('/r/', 1)[-1])
+        if url.endswith('/r/AskReddit/hot.json') or url.endswith('/r/worldnews/hot.json'):
+            children = [{'data': {'title': f'{url} {i}', 'permalink': f'/{i}'}} for i in range(3)]
+            return {'data': {'children': children}}
+        return {'data': {'children': []}}
+    
+    with _scraper(ttl=60) as scraper:
+        scraper._get_json = get_json
+        posts = scraper.search_posts('nothing matches', limit=5)
+    
+    assert len(posts) == 5
+    assert requested[2:] == ['AskReddit/hot.json', 'worldnews/hot.json']
+
+def test_response_cache_evicts_least_recently_used():
+    cache = _ResponseCache(maxsize=2, ttl=60)
+    cache.put('a', None, 1)
+    cache.put('b', None, 2)
+    cache.get('a')
+    cache.put('c', None, 3)
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == (True, None, 1)
+    assert cache.get('c') == (True, None, 3)
+
+def test_response_cache_reports_stale_entries(monkeypatch):
+    now = SimpleNamespace(value=0.0)
+    monkeypatch.setattr(reddit_scraper, 'time', SimpleNamespace(monotonic=lambda: now.value))
+    cache = _ResponseCache(maxsize=2, ttl=60)
+    cache.put('a', '"v1"', {'data': {}})
+    
+    now.value = 59
+    assert cache.get('a')[0] is True
+    now.value = 60
+    assert cache.get('a') == (False, '"v1"', {'data': {}})
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    """A clock that only moves when the code under test sleeps"""
+    clock = SimpleNamespace(now=0.0, sleeps=[])
+    
+    def sleep(seconds):
+        clock.sleeps.append(seconds)
+        clock.now += seconds
+    
+    monkeypatch.setattr(reddit_scraper, 'time', SimpleNamespace(monotonic=lambda: clock.now, sleep=sleep))
+    return clock
+
+def test_rate_limiter_allows_a_full_window_without_waiting(fake_time):
+    limiter = _RateLimiter(max_calls=3, period=60)
+    for _ in range(3):
+        limiter.wait_if_throttled()
+    
+    assert fake_time.sleeps == []
+
+def test_rate_limiter_waits_for_the_oldest_call_to_leave_the_window(fake_time):
+    limiter = _RateLimiter(max_calls=2, period=60)
+    limiter.wait_if_throttled()
+    fake_time.now = 10
+    limiter.wait_if_throttled()
+    fake_time.now = 20
+    limiter.wait_if_throttled()
+    
+    assert fake_time.sleeps == [40]
+    
+    # Once the window has passed, calls go through again
+    fake_time.now = 200
+    limiter.wait_if_throttled()
+    assert fake_time.sleeps == [40]
+
+def test_rate_limiter_queues_waiters_into_successive_slots(fake_time):
+    limiter = _RateLimiter(max_calls=1, period=60)
+    limiter.wait_if_throttled()
+    
+    # Two callers arriving together are spaced a full period apart
+    reserved = []
+    for _ in range(2):
+        before = fake_time.now
+        limiter.wait_if_throttled()
+        reserved.append(fake_time.now - before)
+        fake_time.now = before
+    
+    assert reserved == [60, 120]
+
+def test_rate_limiter_fails_fast_past_max_wait(fake_time):
+    limiter = _RateLimiter(max_calls=1, period=60, max_wait=5)
+    limiter.wait_if_throttled()
+    
+    with pytest.raises(RateLimitExceeded):
+        limiter.wait_if_throttled()
+    assert fake_time.sleeps == []
+    
+    # The refused call did not take a slot, so the window frees up on time
+    fake_time.now = 58
+    limiter.wait_if_throttled()
+    assert fake_time.sleeps == [2]
+
+def test_header_throttle_is_capped(fake_time):
+    response = SimpleNamespace(headers={
+        'X-Ratelimit-Remaining': '1', 'X-Ratelimit-Used': '99', 'X-Ratelimit-Reset': '600'
+    })
+    _throttle_from_headers(response)
+    
+    assert fake_time.sleeps == [_MAX_THROTTLE_WAIT]
+
+def test_header_throttle_ignores_plenty_of_quota(fake_time):
+    response = SimpleNamespace(headers={
+        'X-Ratelimit-Remaining': '90', 'X-Ratelimit-Used': '10', 'X-Ratelimit-Reset': '600'
+    })
+    _throttle_from_headers(response)
+    
+    assert fake_time.sleeps == []
+
+# Top-level comments as PRAW returns them; one was deleted and one is a MoreComments stub
+_COMMENTS = [
+    SimpleNamespace(body='first'),
+    SimpleNamespace(body='[deleted]'),
+    SimpleNamespace(),
+    SimpleNamespace(body='fourth'),
+    SimpleNamespace(body='fifth'),
+]
+
+class _AsyncCommentForest:
+    def __init__(self, comments):
+        self._comments = comments
+    
+    async def replace_more(self, limit=None):
+        pass
+    
+    async def __aiter__(self):
+        for comment in self._comments:
+            yield comment
+
+class _AsyncReddit:
+    """Stands in for asyncpraw.Reddit, as a client and as its async context manager"""
+    
+    def __init__(self, **credentials):
+        pass
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        pass
+    
+    async def submission(self, url):
+        return SimpleNamespace(comments=_AsyncCommentForest(_COMMENTS))
+
+class _SyncCommentForest(list):
+    def replace_more(self, limit=None):
+        pass
+
+def _api_scraper() -> RedditScraper:
+    scraper = RedditScraper.__new__(RedditScraper)
+    scraper._credentials = {}
+    scraper.reddit = SimpleNamespace(submission=lambda url: SimpleNamespace(comments=_SyncCommentForest(_COMMENTS)))
+    return scraper
+
+@pytest.mark.parametrize('limit', [1, 3, 4, 10])
+def test_async_comments_match_sync_comments(monkeypatch, limit):
+    scraper = _api_scraper()
+    sync_comments = scraper.get_many_comments(['u1', 'u2'], limit)
+    
+    monkeypatch.setattr(reddit_scraper, 'asyncpraw', SimpleNamespace(Reddit=_AsyncReddit))
+    async_comments = scraper.get_many_comments(['u1', 'u2'], limit)
+    
+    assert async_comments == sync_comments
+    assert async_comments[0] == [c.body for c in _COMMENTS[:limit] if getattr(c, 'body', '[deleted]') != '[deleted]']
+
+@pytest.mark.parametrize('retry_after, expected', [('2', 2.0), ('Wed, 21 Oct 2015 07:28:00 GMT', None), (None, None)])
+def test_ratelimit_retry_reads_retry_after_defensively(fake_time, retry_after, expected):
+    error = TooManyRequests.__new__(TooManyRequests)
+    error.retry_after = retry_after
+    failures = [error]
+    
+    def fetch():
+        if failures:
+            raise failures.pop()
+        return 'ok'
+    
+    assert _retry_on_ratelimit(fetch) == 'ok'
+    if expected is None:
+        # Falls back to the first backoff step: 0.5s plus up to 0.5s of jitter
+        assert 0.5 <= fake_time.sleeps[0] <= 1.0
+    else:
+        assert fake_time.sleeps == [expected]
@@ -0,0 +1,48 @@
+"""
+Tests for TextSummarizer's text cleaning
+"""
+
+import random
+import re
+
+import pytest
+
+from text_summarizer import TextSummarizer
+
+def _three_pass_clean(text: str) -> str:
+    """clean_text as it was before the passes were fused into one regex"""
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+# Pieces that exercise URLs, punctuation, unicode and unusual whitespace
+_PIECES = [
+    'word', 'Z9', ' ', '  ', '\t', '\n', '\r\n', '\x0b', '\x1c', ' ', ' ',
+    '.', '!', '?', ':', '/', '-', '_', '$', '@', '&', '%', '%2F', 'é', 'İ', '😀',
+    'http://', 'https://', 'https://example.com/a?b=1&c=%20', 'http://x.co/(y)',
+    'http:', '//', 'www.reddit.com',
+]
+
+@pytest.fixture(scope='module')
+def summarizer():
+    # Injecting the stop words skips the NLTK corpus lookup
+    return TextSummarizer(stop_words=frozenset())
+
+@pytest.mark.parametrize('text', [
+    '',
+    '   ',
+    'Plain sentence.',
+    'See https://example.com/path?x=1 for details!',
+    'Link:http://a.b/c,then text',
+    'Tabs\tand\nnewlines\r\n  everywhere  ',
+    'Ünïcödé and emoji 😀 are dropped',
+])
+def test_clean_text_matches_three_pass_version(summarizer, text):
+    assert summarizer.clean_text(text) == _three_pass_clean(text)
+
+def test_clean_text_matches_three_pass_version_on_random_text(summarizer):
+    rng = random.Random(1234)
+    for _ in range(20000):
+        text = ''.join(rng.choice(_PIECES) for _ in range(rng.randint(0, 12)))
+        assert summarizer.clean_text(text) == _three_pass_clean(text), repr(text)
@@ -1,103 +1,154 @@
+import heapq
+import logging
 import re
-from typing import List, Dict
+from operator import itemgetter
+from typing import List, Dict, FrozenSet
 from collections import Counter
+from functools import lru_cache
+from itertools import accumulate, takewhile
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.stem import PorterStemmer
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from models import PostSummary
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+logger = logging.getLogger(__name__)
+
+# Compiled once; plain regex tokenizing is all bag-of-words scoring needs
+# URLs first, otherwise any single character that isn't a letter, digit or whitespace
+_CLEAN_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+|[^a-zA-Z0-9\s]')
+_WORD_RE = re.compile(r'[A-Za-z0-9]+')
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+_SENT_END_RE = re.compile(r'[.!?]+')
+_SENT_BREAK_RE = re.compile(r'[.!?]+\s+|\n+')
+_SIMPLE_WORD_RE = re.compile(r'\b\w+\b')
+
+# Words SimpleSummarizer leaves out of key points; built once rather than per call
+_SIMPLE_STOPWORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'})
+
+def _select_by_words(sentences: List[str], ranked: List[int], max_words: int) -> List[int]:
+    """Take ranked sentence indices until the next one would exceed max_words"""
+    # Running word totals, evaluated lazily so counting stops at the first sentence that overflows
+    running_totals = accumulate(len(sentences[i].split()) for i in ranked)
+    cut = sum(1 for _ in takewhile(lambda total: total <= max_words, running_totals))
+    logger.debug("Selected %d of %d sentences under a %d word limit", cut, len(ranked), max_words)
+    return ranked[:cut]
+
+def _select_by_paragraphs(sentences: List[str], ranked: List[int], max_paragraphs: int) -> List[int]:
+    """Take enough ranked sentence indices to fill max_paragraphs paragraphs"""
+    # Group sentences into paragraphs (roughly 3-4 sentences per paragraph)
+    sentences_per_paragraph = max(1, len(sentences) // max_paragraphs)
+    return ranked[:max_paragraphs * sentences_per_paragraph]
+
+def _select_by_sentences(ranked: List[int], num_sentences: int) -> List[int]:
+    """Take the num_sentences best ranked sentence indices"""
+    return ranked[:num_sentences]
+
+def _select_sentences(sentences: List[str], ranked: List[int], num_sentences: int, max_words: int = None, max_paragraphs: int = None) -> List[int]:
+    """Pick sentence indices from ranked under whichever length limit applies"""
+    if max_words:
+        return _select_by_words(sentences, ranked, max_words)
+    if max_paragraphs:
+        return _select_by_paragraphs(sentences, ranked, max_paragraphs)
+    return _select_by_sentences(ranked, num_sentences)
+
+@lru_cache(maxsize=1)
+def ensure_nltk_data():
+    """
+    Download the NLTK data the summarizer needs, checking only once per process
+    
+    A failed download raises LookupError, which lru_cache does not store,
+    so the next call tries again.
+    """
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        if not nltk.download('stopwords'):
+            raise LookupError("Could not download the NLTK stopwords corpus")
 
 class TextSummarizer:
     """
     Text summarization using extractive methods (no API keys required)
     """
     
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        self.stemmer = PorterStemmer()
+    def __init__(self, stop_words: FrozenSet[str] = None, stemmer: PorterStemmer = None):
+        # Callers that already hold the NLTK resources pass them in; otherwise load them here
+        if stop_words is None:
+            ensure_nltk_data()
+            stop_words = frozenset(stopwords.words('english'))
+        self.stop_words = stop_words
+        self.stemmer = stemmer if stemmer is not None else PorterStemmer()
     
     def clean_text(self, text: str) -> str:
         """
         Clean and preprocess text
         """
-        # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        # Remove special characters and extra whitespace
-        text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        # Remove URLs and special characters in one pass, then collapse whitespace
+        return ' '.join(_CLEAN_RE.sub('', text).split())
+    
+    def keyword_counts(self, text: str) -> Counter:
+        """
+        Count candidate keywords (non-stopwords longer than two letters) in text
+        """
+        return self._count_lowered(self.clean_text(text).lower())
+    
+    def _count_lowered(self, lowered_text: str) -> Counter:
+        # Tokenize, filter and count in one stream, without building word lists
+        stop_words = self.stop_words
+        word_freq = Counter()
+        words = (match.group() for match in _WORD_RE.finditer(lowered_text))
+        word_freq.update(word for word in words if word not in stop_words and len(word) > 2)
+        return word_freq
     
     def extract_keywords(self, text: str, num_keywords: int = 10) -> List[str]:
         """
         Extract keywords from text using TF-IDF-like approach
         """
-        # Clean text
-        cleaned_text = self.clean_text(text)
-        
-        # Tokenize and filter
-        words = word_tokenize(cleaned_text.lower())
-        words = [word for word in words if word not in self.stop_words and len(word) > 2]
-        
-        # Count word frequencies
-        word_freq = Counter(words)
-        
         # Return top keywords
-        return [word for word, freq in word_freq.most_common(num_keywords)]
+        word_freq = self.keyword_counts(text)
+        return [word for word, freq in heapq.nlargest(num_keywords, word_freq.items(), key=itemgetter(1))]
     
-    def calculate_sentence_scores(self, sentences: List[str], keywords: List[str]) -> Dict[str, float]:
+    def calculate_sentence_scores(self, sentences: List[str], keywords: List[str]) -> List[float]:
         """
-        Calculate scores for sentences based on keyword frequency
+        Calculate scores for sentences based on keyword frequency, aligned with sentences
         """
-        sentence_scores = {}
+        sentence_scores = []
+        # Set membership instead of scanning the keyword list for every word
+        keyword_set = set(keywords)
+        stop_words = self.stop_words
         
         for sentence in sentences:
-            sentence_words = word_tokenize(sentence.lower())
-            sentence_words = [word for word in sentence_words if word not in self.stop_words]
-            
-            score = 0
-            for word in sentence_words:
-                if word in keywords:
-                    score += 1
+            sentence_words = [word for word in _WORD_RE.findall(sentence.lower()) if word not in stop_words]
             
-            if len(sentence_words) > 0:
-                sentence_scores[sentence] = score / len(sentence_words)
+            if sentence_words:
+                sentence_scores.append(sum(word in keyword_set for word in sentence_words) / len(sentence_words))
             else:
-                sentence_scores[sentence] = 0
+                sentence_scores.append(0)
                 
         return sentence_scores
     
-    def summarize_text(self, text: str, num_sentences: int = 3, max_words: int = None, max_paragraphs: int = None) -> str:
+    def summarize_text(self, text: str, num_sentences: int = 3, max_words: int = None, max_paragraphs: int = None, word_freq: Counter = None) -> str:
         """
         Summarize text using extractive summarization with word/paragraph limits
+        
+        word_freq, if given, must be keyword_counts(text); it saves counting again
+        """
+        return self._summarize_cleaned(text, self.clean_text(text), num_sentences, max_words, max_paragraphs, word_freq)
+    
+    def _summarize_cleaned(self, text: str, cleaned_text: str, num_sentences: int = 3, max_words: int = None, max_paragraphs: int = None, word_freq: Counter = None) -> str:
+        """
+        summarize_text for a text that has already been through clean_text
         """
         if not text or len(text.strip()) < 50:
             return text
         
-        # Clean text
-        cleaned_text = self.clean_text(text)
-        
-        # Split into sentences with fallback
-        try:
-            sentences = sent_tokenize(cleaned_text)
-        except:
-            # Fallback: simple sentence splitting
-            sentences = re.split(r'[.!?]+', cleaned_text)
-            sentences = [s.strip() for s in sentences if s.strip()]
+        # Split into sentences
+        sentences = [s.strip() for s in _SENT_RE.split(cleaned_text) if s.strip()]
         
         # If still only 1 sentence, try more aggressive splitting
         if len(sentences) <= 1:
             # Split by common sentence endings and newlines
-            sentences = re.split(r'[.!?]+\s+|\n+', cleaned_text)
+            sentences = _SENT_BREAK_RE.split(cleaned_text)
             sentences = [s.strip() for s in sentences if s.strip() and len(s) > 10]
         
         # If we have a word limit, we should apply it even with few sentences
@@ -114,44 +165,19 @@ class TextSummarizer:
                 return cleaned_text
         
         # Extract keywords
-        keywords = self.extract_keywords(cleaned_text)
+        if word_freq is None:
+            word_freq = self._count_lowered(cleaned_text.lower())
+        keywords = [word for word, freq in heapq.nlargest(10, word_freq.items(), key=itemgetter(1))]
         
         # Calculate sentence scores
         sentence_scores = self.calculate_sentence_scores(sentences, keywords)
         
-        # Get top sentences
-        top_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Apply word limit if specified
-        if max_words:
-            selected_sentences = []
-            word_count = 0
-            for sentence, score in top_sentences:
-                sentence_words = len(sentence.split())
-                if word_count + sentence_words <= max_words:
-                    selected_sentences.append((sentence, score))
-                    word_count += sentence_words
-                else:
-                    break
-            top_sentences = selected_sentences
-        
-        # Apply paragraph limit if specified
-        elif max_paragraphs:
-            # Group sentences into paragraphs (roughly 3-4 sentences per paragraph)
-            sentences_per_paragraph = max(1, len(sentences) // max_paragraphs)
-            top_sentences = top_sentences[:max_paragraphs * sentences_per_paragraph]
-        
-        # Otherwise use sentence limit
-        else:
-            top_sentences = top_sentences[:num_sentences]
-        
-        # Sort by original order
-        top_sentences.sort(key=lambda x: sentences.index(x[0]))
+        # Get top sentences, as indices into sentences
+        ranked = sorted(range(len(sentences)), key=sentence_scores.__getitem__, reverse=True)
+        top_sentences = _select_sentences(sentences, ranked, num_sentences, max_words, max_paragraphs)
         
-        # Create final summary
-        final_summary = ' '.join([sentence for sentence, score in top_sentences])
-        
-        return final_summary
+        # Create final summary in original order
+        return ' '.join([sentences[i] for i in sorted(top_sentences)])
     
     def summarize_reddit_posts(self, posts: List[Dict], query: str = None, max_words: int = None, max_paragraphs: int = None) -> Dict:
         """
@@ -165,34 +191,50 @@ class TextSummarizer:
                 'query': query
             }
         
-        # Combine all text content
-        all_text = ""
+        # Read each field once into parallel lists
+        titles = [post.get('title', '') for post in posts]
+        contents = [post.get('content', '') for post in posts]
+        scores = [post.get('score', 0) for post in posts]
+        subreddits = [post.get('subreddit', 'unknown') for post in posts]
+        urls = [post.get('permalink', '') for post in posts]
+        
+        # Combine all text content, skipping posts with no text
+        post_texts = [f"{title} {content}" for title, content in zip(titles, contents)]
+        kept = [i for i, post_text in enumerate(post_texts) if post_text.strip()]
+        all_text = ' '.join([post_texts[i] for i in kept])
+        
+        # Clean, tokenize and count each post once; cleaning works character by character
+        # outside URLs, so the combined text cleans to the cleaned posts joined together
+        cleaned_texts = [self.clean_text(post_texts[i]) for i in kept]
+        all_cleaned = ' '.join([cleaned for cleaned in cleaned_texts if cleaned])
+        post_word_freqs = [self._count_lowered(cleaned.lower()) for cleaned in cleaned_texts]
+        word_freq = Counter()
+        for post_word_freq in post_word_freqs:
+            word_freq.update(post_word_freq)
+        
+        # Create individual post summaries
+        post_max_words = max_words//len(posts) if max_words else None
         post_summaries = []
-        
-        for post in posts:
-            post_text = f"{post.get('title', '')} {post.get('content', '')}"
-            if post_text.strip():
-                all_text += post_text + " "
-                # Create individual post summary
-                post_summary = {
-                    'title': post.get('title', '')[:100] + '...' if len(post.get('title', '')) > 100 else post.get('title', ''),
-                    'summary': self.summarize_text(post_text, num_sentences=2, max_words=max_words//len(posts) if max_words else None),
-                    'score': post.get('score', 0),
-                    'subreddit': post.get('subreddit', 'unknown'),
-                    'url': post.get('permalink', '')
-                }
-                post_summaries.append(post_summary)
+        for i, cleaned, post_word_freq in zip(kept, cleaned_texts, post_word_freqs):
+            title = titles[i]
+            post_summaries.append(PostSummary(
+                title=title[:100] + '...' if len(title) > 100 else title,
+                summary=self._summarize_cleaned(post_texts[i], cleaned, num_sentences=2, max_words=post_max_words, word_freq=post_word_freq),
+                score=scores[i],
+                subreddit=subreddits[i],
+                url=urls[i]
+            ))
         
         # Create overall summary with user-specified length
         if max_words:
-            overall_summary = self.summarize_text(all_text, max_words=max_words)
+            overall_summary = self._summarize_cleaned(all_text, all_cleaned, max_words=max_words, word_freq=word_freq)
         elif max_paragraphs:
-            overall_summary = self.summarize_text(all_text, max_paragraphs=max_paragraphs)
+            overall_summary = self._summarize_cleaned(all_text, all_cleaned, max_paragraphs=max_paragraphs, word_freq=word_freq)
         else:
-            overall_summary = self.summarize_text(all_text, num_sentences=5)
+            overall_summary = self._summarize_cleaned(all_text, all_cleaned, num_sentences=5, word_freq=word_freq)
         
         # Extract key points
-        key_points = self.extract_keywords(all_text, num_keywords=15)
+        key_points = [word for word, freq in heapq.nlargest(15, word_freq.items(), key=itemgetter(1))]
         
         return {
             'summary': overall_summary,
@@ -219,7 +261,7 @@ class SimpleSummarizer:
             return text
         
         # Split by sentences (simple approach)
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENT_END_RE.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         if len(sentences) <= num_sentences:
@@ -231,39 +273,14 @@ class SimpleSummarizer:
             score = len(sentence.split())  # Word count
             if i == 0:  # First sentence bonus
                 score *= 1.5
-            sentence_scores.append((sentence, score))
-        
-        # Sort by score
-        sentence_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Apply word limit if specified
-        if max_words:
-            print(f"SimpleSummarizer Debug: Applying word limit of {max_words} to {len(sentence_scores)} sentences")
-            selected_sentences = []
-            word_count = 0
-            for sentence, score in sentence_scores:
-                sentence_words = len(sentence.split())
-                if word_count + sentence_words <= max_words:
-                    selected_sentences.append((sentence, score))
-                    word_count += sentence_words
-                else:
-                    break
-            sentence_scores = selected_sentences
-            print(f"SimpleSummarizer Debug: Selected {len(sentence_scores)} sentences with {word_count} words")
-        
-        # Apply paragraph limit if specified
-        elif max_paragraphs:
-            sentences_per_paragraph = max(1, len(sentences) // max_paragraphs)
-            sentence_scores = sentence_scores[:max_paragraphs * sentences_per_paragraph]
-        
-        # Otherwise use sentence limit
-        else:
-            sentence_scores = sentence_scores[:num_sentences]
+            sentence_scores.append(score)
         
-        # Sort by original order
-        sentence_scores.sort(key=lambda x: sentences.index(x[0]))
+        # Sort by score, as indices into sentences
+        ranked = sorted(range(len(sentences)), key=sentence_scores.__getitem__, reverse=True)
+        top_sentences = _select_sentences(sentences, ranked, num_sentences, max_words, max_paragraphs)
         
-        return '. '.join([sentence for sentence, score in sentence_scores]) + '.'
+        # Join in original order
+        return '. '.join([sentences[i] for i in sorted(top_sentences)]) + '.'
     
     def summarize_reddit_posts(self, posts: List[Dict], query: str = None, max_words: int = None, max_paragraphs: int = None) -> Dict:
         """
@@ -277,23 +294,30 @@ class SimpleSummarizer:
                 'query': query
             }
         
-        # Combine all text content
-        all_text = ""
-        post_summaries = []
+        # Read each field once into parallel lists
+        titles = [post.get('title', '') for post in posts]
+        contents = [post.get('content', '') for post in posts]
+        scores = [post.get('score', 0) for post in posts]
+        subreddits = [post.get('subreddit', 'unknown') for post in posts]
+        urls = [post.get('permalink', '') for post in posts]
+        
+        # Combine all text content, skipping posts with no text
+        post_texts = [f"{title} {content}" for title, content in zip(titles, contents)]
+        kept = [i for i, post_text in enumerate(post_texts) if post_text.strip()]
+        all_text = ' '.join([post_texts[i] for i in kept])
         
-        for post in posts:
-            post_text = f"{post.get('title', '')} {post.get('content', '')}"
-            if post_text.strip():
-                all_text += post_text + " "
-                # Create individual post summary
-                post_summary = {
-                    'title': post.get('title', '')[:100] + '...' if len(post.get('title', '')) > 100 else post.get('title', ''),
-                    'summary': self.summarize_text(post_text, num_sentences=2, max_words=max_words//len(posts) if max_words else None),
-                    'score': post.get('score', 0),
-                    'subreddit': post.get('subreddit', 'unknown'),
-                    'url': post.get('permalink', '')
-                }
-                post_summaries.append(post_summary)
+        # Create individual post summaries
+        post_max_words = max_words//len(posts) if max_words else None
+        post_summaries = []
+        for i in kept:
+            title = titles[i]
+            post_summaries.append(PostSummary(
+                title=title[:100] + '...' if len(title) > 100 else title,
+                summary=self.summarize_text(post_texts[i], num_sentences=2, max_words=post_max_words),
+                score=scores[i],
+                subreddit=subreddits[i],
+                url=urls[i]
+            ))
         
         # Create overall summary with user-specified length
         if max_words:
@@ -304,11 +328,10 @@ class SimpleSummarizer:
             overall_summary = self.summarize_text(all_text, num_sentences=5)
         
         # Simple keyword extraction
-        words = re.findall(r'\b\w+\b', all_text.lower())
+        words = _SIMPLE_WORD_RE.findall(all_text.lower())
         word_freq = Counter(words)
         # Filter out common words
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'}
-        key_points = [word for word, freq in word_freq.most_common(20) if word not in common_words and len(word) > 2][:15]
+        key_points = [word for word, freq in heapq.nlargest(20, word_freq.items(), key=itemgetter(1)) if word not in _SIMPLE_STOPWORDS and len(word) > 2][:15]
         
         return {
             'summary': overall_summary,